@@ -1,5 +1,6 @@
 """Patterns for communication protocol between microservices or modules to interact with different objects"""
-import rpyc
+from rpyc.core.stream import SocketStream
+from rpyc.utils.factory import connect_stream
 from rpyc.utils.server import ThreadedServer
 
 
@@ -39,9 +40,10 @@ def client(addr, port, *args, **kwargs):
         port : int
             port
     """
-    obj = rpyc.connect(
-        addr, port, config={"allow_all_attrs": True, "allow_pickle": True}
-    )
+    # every remote call is a small request waiting on its reply, send it
+    # right away instead of letting Nagle's algorithm hold it back
+    stream = SocketStream.connect(addr, port, nodelay=True, keepalive=True)
+    obj = connect_stream(stream, config={"allow_all_attrs": True, "allow_pickle": True})
 
     print(f"Connected to server in {addr}:{port}")
     return obj.root
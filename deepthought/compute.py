@@ -1,5 +1,10 @@
+import math
+
+import numba
 import numpy as np
 
+_4PI = 4 * math.pi
+
 
 def circularity(perimeter, area):
     """Calculate the circularity of the region
@@ -16,7 +21,7 @@ def circularity(perimeter, area):
     circularity : float
         The circularity of the region as defined by 4*pi*area / perimeter^2
     """
-    circularity = 4 * np.pi * area / (perimeter**2)
+    circularity = _4PI * area / (perimeter * perimeter)
 
     return circularity
 
@@ -26,10 +31,7 @@ def calculate_anisotropy(parallel, perpendicular, g_factor=0.95, bg=100):
 
     # bg is also subtracted from regions outside the nucleus, which makes it
     # -100, resulting in incorrect anisotropy
-    parallel = parallel - bg
-    perpendicular = perpendicular - bg
-
-    amap = calculate_r(parallel, perpendicular, g_factor)
+    amap = _anisotropy(parallel, perpendicular, g_factor, bg)
     return amap
 
 
@@ -41,24 +43,65 @@ def calculate_r(parallel, perpendicular, g_factor):
         Parallel channel
 
     perpendicular : ndarray
-        Perpendicular channel
+        Perpendicular channel, same shape as `parallel`
 
     g_factor : float
         Correction factor to remove bias in detection
 
     Returns
     -------
-    anisotropy_map : ndarray
+    anisotropy_map : ndarray of float32
         Anisotropy image
     """
-    numerator = parallel - (g_factor * perpendicular)
-    denominator = parallel + (2 * g_factor * perpendicular)
-
-    with np.errstate(divide="ignore", invalid="ignore"):
-        anisotropy_map = np.true_divide(numerator, denominator)
-        anisotropy_map[~np.isfinite(anisotropy_map)] = 0
+    anisotropy_map = _anisotropy(parallel, perpendicular, g_factor, 0)
+    return anisotropy_map
 
-    anisotropy_map[anisotropy_map >= 1] = 0
-    anisotropy_map[anisotropy_map <= 0] = 0
 
+def _anisotropy(parallel, perpendicular, g_factor, bg):
+    """run the fused anisotropy kernel over arrays of any (matching) shape"""
+    # the kernel walks both inputs with the same flat index, so broadcast
+    # them first (and raise on mismatched shapes) as numpy used to
+    parallel, perpendicular = np.broadcast_arrays(parallel, perpendicular)
+
+    # camera frames are integer, subtract bg with numpy so that pixels below
+    # bg wrap around in the frame dtype exactly as before
+    if bg and np.result_type(parallel, bg).kind in "iu":
+        parallel = parallel - bg
+        perpendicular = perpendicular - bg
+        bg = 0
+
+    parallel = np.ascontiguousarray(parallel)
+    perpendicular = np.ascontiguousarray(perpendicular)
+
+    # r lies in [0, 1), float32 is plenty and halves the output traffic
+    anisotropy_map = np.empty(parallel.shape, dtype=np.float32)
+    _anisotropy_kernel(
+        parallel.reshape(-1),
+        perpendicular.reshape(-1),
+        float(g_factor),
+        float(bg),
+        anisotropy_map.reshape(-1),
+    )
     return anisotropy_map
+
+
+@numba.njit(parallel=True, cache=True)
+def _anisotropy_kernel(parallel, perpendicular, g_factor, bg, out):
+    """bg subtraction, r = (par - g*perp) / (par + 2*g*perp) and the
+    clipping of values outside (0, 1) to 0, in a single pass per pixel"""
+    for i in numba.prange(out.size):
+        par = parallel[i] - bg
+        perp = perpendicular[i] - bg
+
+        numerator = par - (g_factor * perp)
+        denominator = par + (2 * g_factor * perp)
+
+        r = 0.0
+        if denominator != 0:
+            r = numerator / denominator
+
+        # clip the stored float32 value, r just below 1 rounds up to 1.0 when
+        # it is narrowed; the comparison also catches nan
+        out[i] = r
+        if not (0 < out[i] < 1):
+            out[i] = 0.0
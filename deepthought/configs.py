@@ -1,29 +1,28 @@
-from collections import OrderedDict
+from types import MappingProxyType
 import os
 
-config = OrderedDict()
+DEFAULT_MM_DIR = r"C:\Program Files\Micro-Manager-2.0gamma"
+DEFAULT_MM_CONFIG = "./mmconfigs/Bright_Star.cfg"
+DEFAULT_MM_SERVER = "localhost"
 
+_CWD = os.getcwd()
 
-def abspath(path):
-    return os.path.abspath(path)
 
+def _abspath(path):
+    # same as os.path.abspath, against the working directory at import
+    return os.path.normpath(os.path.join(_CWD, path))
 
-def read_env_value(name, default):
-    if name in os.environ:
-        value = os.environ[name]
-    else:
-        value = default
-    return value
 
-
-MM_DIR = {"name": "MM_DIR", "default": "C:\Program Files\Micro-Manager-2.0gamma"}
-MM_CONFIG = {"name": "MM_CONFIG", "default": "./mmconfigs/Bright_Star.cfg"}
-MM_SERVER = {
-    "name": "MM_SERVER",
-    "default": "localhost",
-}
-config["mm_dir"] = abspath(read_env_value(**MM_DIR))
-config["mm_config"] = abspath(read_env_value(**MM_CONFIG))
-config["mm_server"] = {"addr": read_env_value(**MM_SERVER), "port": 18861}
+# resolved once at import, read-only afterwards
+config = MappingProxyType(
+    {
+        "mm_dir": _abspath(os.environ.get("MM_DIR", DEFAULT_MM_DIR)),
+        "mm_config": _abspath(os.environ.get("MM_CONFIG", DEFAULT_MM_CONFIG)),
+        "mm_server": {
+            "addr": os.environ.get("MM_SERVER", DEFAULT_MM_SERVER),
+            "port": 18861,
+        },
+    }
+)
 store_disk = True
 # feature toggle
@@ -1,7 +1,27 @@
-from cellpose import models
+import functools
+
 import numpy as np
 
 
+@functools.lru_cache(maxsize=4)
+def _cellpose_model(gpu, model_type):
+    """load a cellpose model once per (gpu, model_type), loading weights is
+    slow and the model is stateless between evaluations"""
+    # cellpose pulls in torch, import it only when a model is needed
+    from cellpose import models
+
+    model = models.Cellpose(gpu=gpu, model_type=model_type)
+
+    # cellpose falls back to the cpu when no gpu is usable
+    if model.gpu:
+        import torch
+
+        # network tiles have a fixed size, let cudnn pick its kernels once
+        torch.backends.cudnn.benchmark = True
+
+    return model
+
+
 class Detector:
     def __init__(self, name, type_):
         self.name = name
@@ -13,19 +33,46 @@ class NuclearDetector(Detector):
         super().__init__(name="cellpose", type_="nuclei")
         self.gpu = 1
         self.diameter = 100  # use unit conversion here
+        self.batch_size = 16  # network tiles per forward pass
+        self.net_avg = False  # one network instead of averaging all four
         self.create_model()
 
     def create_model(self):
-        # define a cellpose model
-        self.model = models.Cellpose(gpu=self.gpu, model_type=self.type_)
+        # define a cellpose model, shared between detectors
+        self.model = _cellpose_model(self.gpu, self.type_)
+        self.warm_up()
+
+    def warm_up(self):
+        """run the network once with the detector's settings, so that the
+        first acquisition does not pay for cuda/cudnn initialisation. Call
+        again after changing net_avg or batch_size."""
+        # on the cpu there is nothing to initialise, it would only cost a
+        # full inference at start-up
+        if not self.model.gpu:
+            return
+
+        rng = np.random.default_rng(0)
+        self.detect(rng.integers(0, 4096, (256, 256), dtype=np.uint16))
 
     def detect(self, image):
-        # evalute the model on the image
-        output = self.model.eval([image], channels=[0, 0], diameter=self.diameter)
-        list_of_labels = output[0]
-        label = list_of_labels[0]
+        label = self.detect_batch([image])[0]
         return label
 
+    def detect_batch(self, images):
+        """detect objects in several images with one eval call, cellpose
+        still runs each image of the list separately. returns one label
+        image per input image"""
+        # evalute the model on the images
+        output = self.model.eval(
+            list(images),
+            batch_size=self.batch_size,
+            net_avg=self.net_avg,
+            channels=[0, 0],
+            diameter=self.diameter,
+        )
+        list_of_labels = output[0]
+        return list_of_labels
+
 
 class AnisotropyFrameDetector(Detector):
     def __init__(self):
@@ -37,9 +84,11 @@ class AnisotropyFrameDetector(Detector):
 
         diff = 50  # workaround to get roughly aligned parallel channel
 
-        label = np.zeros_like(image)
+        # every row is written exactly once, no need to zero the buffer first
+        split = midpoint - diff
+        label = np.empty_like(image)
 
-        label[:midpoint, :] = 1
-        label[midpoint - diff :, :] = 2
+        label[:split, :] = 1
+        label[split:, :] = 2
 
         return label
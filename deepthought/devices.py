@@ -7,32 +7,69 @@ References:
 2. https://github.com/SEBv15/GSD192-tools
 """
 
-import threading
 import time
-from collections import OrderedDict
-from typing import Any, Dict, List, Tuple, TypeVar
-
-from ophyd import Component, Device
-from ophyd import DynamicDeviceComponent as DDCpt
-from ophyd import PseudoPositioner
-from ophyd import PseudoSingle
-from ophyd import SoftPositioner
-from ophyd.pseudopos import pseudo_position_argument
-from ophyd.pseudopos import real_position_argument
+import traceback
+from concurrent.futures import ThreadPoolExecutor
 
 import numpy as np
 from ophyd.status import Status
-from ophyd.status import MoveStatus
-from ophyd.mixins import SignalPositionerMixin
-from ophyd import Signal
 
-from skimage import io
-import warnings
 from comms import client
 import rpyc
 
 import socket
 
+# device operations block on MMCore round trips, run them on a shared pool
+# instead of starting a new thread for every set/trigger. Only set/trigger
+# work goes here: a Status timeout starts counting at submission, so
+# anything else queued on this pool could time out a healthy move.
+_executor = ThreadPoolExecutor(max_workers=8, thread_name_prefix="devices")
+
+# camera subscribers run user code of unknown duration, keep them off the
+# device pool
+_subscriber_executor = ThreadPoolExecutor(
+    max_workers=4, thread_name_prefix="subscribers"
+)
+
+# getProperty round trips of properties()/device_properties(). Tasks on this
+# pool only call getProperty and never submit to it, so it cannot deadlock,
+# and both methods can be called from a device operation.
+_property_executor = ThreadPoolExecutor(max_workers=8, thread_name_prefix="properties")
+
+# one generator for the crop helpers, instead of the legacy global RandomState
+_rng = np.random.default_rng()
+
+
+def _report_exception(future):
+    """print the traceback of a failed pool task, the way an uncaught
+    exception in a plain thread used to be reported"""
+    if future.cancelled():
+        return
+
+    exc = future.exception()
+    if exc is not None:
+        traceback.print_exception(type(exc), exc, exc.__traceback__)
+
+
+def _submit_blocking(obj, fn, timeout=10):
+    """run a blocking MMCore call on the device pool, tracked by a Status"""
+    status = Status(obj=obj, timeout=timeout)
+
+    def run():
+        try:
+            fn()
+        except Exception as exc:
+            status.set_exception(exc)
+        else:
+            status.set_finished()
+
+    # finishing a Status that already timed out raises InvalidState, make
+    # sure that does not vanish with the discarded future
+    future = _executor.submit(run)
+    future.add_done_callback(_report_exception)
+
+    return status
+
 
 class MMCoreInterface:
     def __init__(self):
@@ -86,47 +123,59 @@ class BaseScope:
 
     def device_properties(self, device):
         """get property names and values for the given device"""
-        device_props = {}
-
-        property_names = self.mmc.getDevicePropertyNames(device)
+        property_names = list(self.mmc.getDevicePropertyNames(device))
 
-        for property_name in property_names:
-            value = self.mmc.getProperty(device, property_name)
-            device_props[property_name] = value
+        # same as properties(), keep the getProperty round trips in flight
+        values = _property_executor.map(
+            lambda property_name: self.mmc.getProperty(device, property_name),
+            property_names,
+        )
 
-        return device_props
+        return dict(zip(property_names, values))
 
     def properties(self):
         """get property names and values for all loaded devices in scope"""
-        all_device_props = {}
-
         list_of_devices = self.mmc.getLoadedDevices()
+        all_device_props = {device: {} for device in list_of_devices}
+
+        pairs = [
+            (device, property_name)
+            for device in list_of_devices
+            for property_name in self.mmc.getDevicePropertyNames(device)
+        ]
 
-        for device in list_of_devices:
-            device_props = self.device_properties(device)
-            all_device_props[device] = device_props
+        # keep several getProperty round trips in flight instead of waiting
+        # for each one in turn
+        values = _property_executor.map(lambda pair: self.mmc.getProperty(*pair), pairs)
+
+        for (device, property_name), value in zip(pairs, values):
+            all_device_props[device][property_name] = value
 
         return all_device_props
 
 
+# wavelength -> (channel, intensity) properties of the pE4000
+_LED_TABLE = {
+    wavelength: ("Channel" + channel, "Intensity" + channel)
+    for channel, led_set in {
+        "A": (365, 385, 405, 435),
+        "B": (460, 470, 490, 500),
+        "C": (525, 550, 580, 595),
+        "D": (635, 660, 740, 770),
+    }.items()
+    for wavelength in led_set
+}
+
+
 class pE4000(BaseScope):
     __current_led = None
     __channel = None
     __intensity_label = None
 
     def set_led(self, value):
-        led_channels = {
-            "A": [365, 385, 405, 435],
-            "B": [460, 470, 490, 500],
-            "C": [525, 550, 580, 595],
-            "D": [635, 660, 740, 770],
-        }
-
-        for channel, led_set in led_channels.items():
-            if value in led_set:
-                self.__current_led = value
-                self.__channel = "Channel" + channel
-                self.__intensity_label = "Intensity" + channel
+        if value in _LED_TABLE:
+            self.__channel, self.__intensity_label = _LED_TABLE[value]
+            self.__current_led = value
 
         self.mmc.setProperty("pE4000", self.__channel, self.__current_led)
         return self.__current_led
@@ -162,15 +211,14 @@ class Illumination(pE4000):
 def random_crop(image, size=512):
     """generate a random crop of the image for the given size"""
     x, y = image.shape
-    random_x = np.random.randint(0, int(x / 2))
-    random_y = np.random.randint(0, int(y / 2))
+    random_x, random_y = _rng.integers(0, [x // 2, y // 2])
     cropped_image = image[random_x : random_x + size, random_y : random_y + size]
     return cropped_image
 
 
 def frame_crop(image, size=512, tol=100):
     """generate a random crop of the image for the given size"""
-    error = np.random.randint(0, tol)
+    error = _rng.integers(0, tol)
     x, y = 150, 250
     cropped_image = image[x + error : x + size + error, y + error : y + size + error]
     return cropped_image
@@ -182,39 +230,30 @@ class Focus:
 
     def __init__(self, mmc=None):
         self.mmc = mmc
-        self.mmc_device_name = self.mmc.getFocusDevice()
+        self.mmc_device_name = str(self.mmc.getFocusDevice())
 
     def read(self):
-        data = OrderedDict()
+        data = {}
         data["z"] = {"value": self.mmc.getPosition(), "timestamp": time.time()}
         return data
 
     def describe(self):
-        data = OrderedDict()
+        data = {}
         data["z"] = {"source": "MMCore", "dtype": "number", "shape": []}
         return data
 
     def set(self, value):
-        status = Status(obj=self, timeout=10)
-
         def wait():
-            try:
-                self.mmc.setPosition(float(value))
-                self.mmc.waitForDevice(self.mmc_device_name)
-            except Exception as exc:
-                status.set_exception(exc)
-            else:
-                status.set_finished()
-
-        threading.Thread(target=wait).start()
+            self.mmc.setPosition(float(value))
+            self.mmc.waitForDevice(self.mmc_device_name)
 
-        return status
+        return _submit_blocking(self, wait)
 
-    def read_configuration(self) -> OrderedDict:
-        return OrderedDict()
+    def read_configuration(self) -> dict:
+        return {}
 
-    def describe_configuration(self) -> OrderedDict:
-        return OrderedDict()
+    def describe_configuration(self) -> dict:
+        return {}
 
 
 class Exposure:
@@ -225,46 +264,32 @@ class Exposure:
         self.mmc = mmc
 
     def trigger(self):
-        status = Status(obj=self, timeout=10)
-
-        def wait():
-            status.set_finished()
-
-        threading.Thread(target=wait).start()
-
+        # nothing to wait for, hand back a status that is already done
+        status = Status(obj=self)
+        status.set_finished()
         return status
 
     def set(self, value):
-        status = Status(obj=self, timeout=10)
-
         def wait():
-            try:
-                self.mmc.setExposure(value)
+            self.mmc.setExposure(value)
 
-            except Exception as exc:
-                status.set_exception(exc)
-            else:
-                status.set_finished()
-
-        threading.Thread(target=wait).start()
-
-        return status
+        return _submit_blocking(self, wait)
 
     def read(self):
-        data = OrderedDict()
+        data = {}
         data["exposure"] = {"value": self.mmc.getExposure(), "timestamp": time.time()}
         return data
 
     def describe(self):
-        data = OrderedDict()
+        data = {}
         data["exposure"] = {"source": "MMCore", "dtype": "number", "shape": []}
         return data
 
-    def read_configuration(self) -> OrderedDict:
-        return OrderedDict()
+    def read_configuration(self) -> dict:
+        return {}
 
-    def describe_configuration(self) -> OrderedDict:
-        return OrderedDict()
+    def describe_configuration(self) -> dict:
+        return {}
 
 
 class TransmittedIllumination:
@@ -275,30 +300,20 @@ class TransmittedIllumination:
         self.mmc_device_name = "TransmittedIllumination 2"
 
     def set(self, value):
-        status = Status(obj=self, timeout=10)
-
         def wait():
-            try:
-                self.mmc.setProperty("TransmittedIllumination 2", "Brightness", value)
-                self.mmc.waitForDevice(self.mmc_device_name)
-
-            except Exception as exc:
-                status.set_exception(exc)
-            else:
-                status.set_finished()
+            self.mmc.setProperty("TransmittedIllumination 2", "Brightness", value)
+            self.mmc.waitForDevice(self.mmc_device_name)
 
-        threading.Thread(target=wait).start()
-
-        return status
+        return _submit_blocking(self, wait)
 
     def read(self):
-        data = OrderedDict()
+        data = {}
         value = self.mmc.getProperty("TransmittedIllumination 2", "Brightness")
         data["dia-intensity"] = {"value": int(value), "timestamp": time.time()}
         return data
 
     def describe(self):
-        data = OrderedDict()
+        data = {}
         data["dia-intensity"] = {
             "source": self.mmc_device_name,
             "dtype": "number",
@@ -321,28 +336,18 @@ class Camera:
 
     def _collection_callback(self):
         for subscriber in self._subscribers:
-            threading.Thread(target=subscriber).start()
+            future = _subscriber_executor.submit(subscriber)
+            future.add_done_callback(_report_exception)
 
     def trigger(self):
-        status = Status(obj=self, timeout=30)
-
         def wait():
-            try:
-                self.image_time = time.time()
-                self.mmc.snapImage()
-                self.mmc.waitForDevice(self.mmc_device_name)
-
-                self.image = rpyc.classic.obtain(self.mmc.getImage())
-
-            except Exception as exc:
-                status.set_exception(exc)
+            self.image_time = time.time()
+            self.mmc.snapImage()
+            self.mmc.waitForDevice(self.mmc_device_name)
 
-            else:
-                status.set_finished()
+            self.image = rpyc.classic.obtain(self.mmc.getImage())
 
-        threading.Thread(target=wait).start()
-
-        return status
+        return _submit_blocking(self, wait, timeout=30)
 
     def set_property(self, prop, idx):
         values = self.mmc.getAllowedPropertyValues(self.cam_name, prop)
@@ -356,13 +361,13 @@ class Camera:
         print(self.set_property("PixelReadoutRate", 0))
         print(self.set_property("Sensitivity/DynamicRange", 0))
 
-    def read(self) -> OrderedDict:
-        data = OrderedDict()
+    def read(self) -> dict:
+        data = {}
         data["image"] = {"value": self.image, "timestamp": self.image_time}
         return data
 
     def describe(self):
-        data = OrderedDict()
+        data = {}
         data["image"] = {
             "source": self.mmc_device_name,
             "dtype": "array",
@@ -374,11 +379,11 @@ class Camera:
         if not func in self._subscribers:
             self._subscribers.append(func)
 
-    def describe_configuration(self) -> OrderedDict:
-        return OrderedDict()
+    def describe_configuration(self) -> dict:
+        return {}
 
-    def read_configuration(self) -> OrderedDict:
-        return OrderedDict()
+    def read_configuration(self) -> dict:
+        return {}
 
 
 class AutoFocus:
@@ -388,49 +393,28 @@ class AutoFocus:
     def __init__(self, mmc=None, **kwargs):
         self.mmc = mmc
         self._subscribers = []
-        self.mmc_device_name = self.mmc.getAutoFocusDevice()
+        self.mmc_device_name = str(self.mmc.getAutoFocusDevice())
 
     def trigger(self):
-        status = Status(obj=self, timeout=10)
-
         def wait():
-            try:
-                self.mmc.waitForDevice(self.mmc_device_name)
+            self.mmc.waitForDevice(self.mmc_device_name)
 
-            except Exception as exc:
-                status.set_exception(exc)
-
-            else:
-                status.set_finished()
-
-        threading.Thread(target=wait).start()
-
-        return status
+        return _submit_blocking(self, wait)
 
     def set(self, value):
-        status = Status(obj=self, timeout=10)
-
         def wait():
-            try:
-                if type(value) is bool:
-                    self.mmc.enableContinuousFocus(value)
-                    self.mmc.waitForDevice(self.mmc_device_name)
-
-                elif type(value) is float:
-                    self.mmc.setAutoFocusOffset(value)
-                    self.mmc.waitForDevice(self.mmc_device_name)
-
-            except Exception as exc:
-                status.set_exception(exc)
-            else:
-                status.set_finished()
+            if type(value) is bool:
+                self.mmc.enableContinuousFocus(value)
+                self.mmc.waitForDevice(self.mmc_device_name)
 
-        threading.Thread(target=wait).start()
+            elif type(value) is float:
+                self.mmc.setAutoFocusOffset(value)
+                self.mmc.waitForDevice(self.mmc_device_name)
 
-        return status
+        return _submit_blocking(self, wait)
 
-    def read(self) -> OrderedDict:
-        data = OrderedDict()
+    def read(self) -> dict:
+        data = {}
         data["zdc"] = {
             "value": self.mmc.isContinuousFocusEnabled(),
             "timestamp": time.time(),
@@ -438,7 +422,7 @@ class AutoFocus:
         return data
 
     def describe(self):
-        data = OrderedDict()
+        data = {}
         data["zdc"] = {"source": self.mmc_device_name, "dtype": "boolean", "shape": []}
         return data
 
@@ -446,11 +430,11 @@ class AutoFocus:
         if not func in self._subscribers:
             self._subscribers.append(func)
 
-    def describe_configuration(self) -> OrderedDict:
-        return OrderedDict()
+    def describe_configuration(self) -> dict:
+        return {}
 
-    def read_configuration(self) -> OrderedDict:
-        return OrderedDict()
+    def read_configuration(self) -> dict:
+        return {}
 
 
 class XYStage:
@@ -459,10 +443,10 @@ class XYStage:
 
     def __init__(self, mmc=None):
         self.mmc = mmc
-        self.mmc_device_name = self.mmc.getXYStageDevice()
+        self.mmc_device_name = str(self.mmc.getXYStageDevice())
 
     def read(self):
-        data = OrderedDict()
+        data = {}
         data["xy"] = {
             "value": np.array(self.mmc.getXYPosition()),
             "timestamp": time.time(),
@@ -470,7 +454,7 @@ class XYStage:
         return data
 
     def describe(self):
-        data = OrderedDict()
+        data = {}
         data["xy"] = {
             "source": "MMCore",
             "dtype": "array",
@@ -481,26 +465,17 @@ class XYStage:
         return data
 
     def set(self, value):
-        status = Status(obj=self, timeout=10)
-
         def wait():
-            try:
-                self.mmc.setXYPosition(*value)
-                self.mmc.waitForDevice(self.mmc_device_name)
-            except Exception as exc:
-                status.set_exception(exc)
-            else:
-                status.set_finished()
-
-        threading.Thread(target=wait).start()
+            self.mmc.setXYPosition(*value)
+            self.mmc.waitForDevice(self.mmc_device_name)
 
-        return status
+        return _submit_blocking(self, wait)
 
-    def read_configuration(self) -> OrderedDict:
-        return OrderedDict()
+    def read_configuration(self) -> dict:
+        return {}
 
-    def describe_configuration(self) -> OrderedDict:
-        return OrderedDict()
+    def describe_configuration(self) -> dict:
+        return {}
 
 
 class Channel:
@@ -510,41 +485,30 @@ class Channel:
     def __init__(self, mmc=None):
         self.config_name = "channel"
         self.mmc = mmc
-        self.channels = self.mmc.getAvailableConfigs(self.config_name)
+        self.channels = list(self.mmc.getAvailableConfigs(self.config_name))
 
     def read(self):
-        data = OrderedDict()
+        data = {}
         self.mmc.waitForSystem()
         value = self.mmc.getCurrentConfig(self.config_name)
         data["channel"] = {"value": value, "timestamp": time.time()}
         return data
 
     def describe(self):
-        data = OrderedDict()
+        data = {}
         data["channel"] = {"source": "MMCore", "dtype": "string", "shape": []}
         return data
 
     def set(self, value):
-        status = Status(obj=self, timeout=10)
-
         def wait():
-            try:
-                self.mmc.setConfig(self.config_name, value)
-                self.mmc.waitForConfig(self.config_name, value)
-                self.mmc.waitForSystem()
+            self.mmc.setConfig(self.config_name, value)
+            self.mmc.waitForConfig(self.config_name, value)
+            self.mmc.waitForSystem()
 
-            except Exception as exc:
-                status.set_exception(exc)
-
-            else:
-                status.set_finished()
-
-        threading.Thread(target=wait).start()
-
-        return status
+        return _submit_blocking(self, wait)
 
-    def read_configuration(self) -> OrderedDict:
-        return OrderedDict()
+    def read_configuration(self) -> dict:
+        return {}
 
-    def describe_configuration(self) -> OrderedDict:
-        return OrderedDict()
+    def describe_configuration(self) -> dict:
+        return {}
@@ -1,7 +1,7 @@
 # model describing unit data from the microscope
 
 from labels import Labeller, LabelledImage
-from detection import AnisotropyFrameDetector, NuclearDetector
+from detection import AnisotropyFrameDetector
 from utils import pad_images_similar
 from compute import calculate_anisotropy
 from transform import register
@@ -9,7 +9,6 @@ import numpy as np
 from collections import OrderedDict
 from view import view
 from coords import rc_to_cart
-import pandas as pd
 from data import db
 from process import clear_border
 
@@ -69,16 +68,18 @@ class Frame:
         return objects
 
     def correct_frame_object_xy(self, regions, image):
-        # coordinate transformation from rc to cartesian
-        for reg in regions:
-            rc_coords = np.array([reg.centroid])
-            coords, _ = rc_to_cart(rc_coords, image=image)
-            x, y = coords[0]
-            x = x * self.pixel_size
-            y = y * self.pixel_size
-            x_microns = np.around(x + self.coords[0])
-            y_microns = np.around(y + self.coords[1])
-            reg.xy = [x_microns, y_microns]
+        if len(regions) == 0:
+            return regions
+
+        # coordinate transformation from rc to cartesian, for all regions at once
+        rc_coords = np.array([reg.centroid for reg in regions])
+        coords, _ = rc_to_cart(rc_coords, image=image)
+        xy_microns = coords * self.pixel_size
+        xy_microns += self.coords
+        np.rint(xy_microns, out=xy_microns)
+
+        for reg, xy in zip(regions, xy_microns.tolist()):
+            reg.xy = xy
 
         return regions
 
@@ -1,5 +1,6 @@
+from functools import cached_property
+
 from skimage import measure
-import numpy as np
 
 
 class LabelledImage:
@@ -9,9 +10,12 @@ class LabelledImage:
         self.image = image
         self.label = label
 
+    @cached_property
+    def regions(self):
+        # individual label regions from image, computed on first access only
+        return measure.regionprops(self.label, intensity_image=self.image)
+
     def get_regions(self):
-        # get individual label regions from image
-        self.regions = measure.regionprops(self.label, intensity_image=self.image)
         return self.regions
 
 
@@ -1,8 +1,6 @@
 import numpy as np
 from bluesky import plan_stubs, utils
 from devices import Camera, Focus, Channel, AutoFocus, XYStage
-import threading
-from optimization import shannon_dct
 from scanspec.specs import Line
 from scanspec.regions import Circle
 from frames import ObjectsAlbum, Frame, SingleLabelFrames
@@ -80,6 +78,8 @@ class BaseMicroscope:
             start_y = initial_y
             stop_y = (width * (num + 1)) + start_y
 
+        # ~ snakes x, so every other row is traversed backwards and the stage
+        # never makes a full return sweep between rows
         spec = Line("y", start_y, stop_y, num) * ~Line("x", start_x, stop_x, num)
 
         disk = Disk()
@@ -126,15 +126,19 @@ class BaseMicroscope:
     def snap_image_and_other_readings_too(self, channel=None):
         """trigger the camera and other devices associated with snapping
         an image"""
-        try:
-            if channel is not None:
-                yield from self.set_channel(channel)
-            yield from plan_stubs.trigger_and_read(self.detectors)
-            yield from plan_stubs.wait()
-        except utils.FailedStatus:
-            print("RECOVERING FROM FAILURE")
-            yield from plan_stubs.sleep(5)
-            yield from self.snap_image_and_other_readings_too()
+        while True:
+            try:
+                if channel is not None:
+                    yield from self.set_channel(channel)
+                yield from plan_stubs.trigger_and_read(self.detectors)
+                yield from plan_stubs.wait()
+            except utils.FailedStatus:
+                print("RECOVERING FROM FAILURE")
+                yield from plan_stubs.sleep(5)
+                # retries only snap again, the channel is not set again
+                channel = None
+            else:
+                break
 
     def set_channel(self, channel):
         """set MMConfigGroup and camera exposure"""
@@ -196,35 +200,38 @@ class Microscope(BaseMicroscope):
 
         grid = self.generate_grid(*initial_coords, pos="left", num=num)
 
-        def inner_loop():
+        # cycles + 1 time points, the last one included
+        for t in range(cycles + 1):
+            self.current_t = t
             self.album.set_current_group(self.current_t)
             yield from self.scan_an_xy(channels, grid=grid)
             yield from plan_stubs.sleep(delta_t)
-            self.current_t += 1
-
-        # time recursion
-        while True:
-            if self.current_t >= cycles:
-                yield from inner_loop()
-                break
 
-            else:
-                yield from inner_loop()
+    def cellular_objects(self, channels, next_coords=None):
+        """snap all channels at the current position and detect objects.
 
-    def cellular_objects(self, channels):
+        If `next_coords` is given, the stage starts moving there as soon as
+        the last channel is read, so the move overlaps with detection. The
+        move is tracked in the "next_xy" group and has to be waited on by
+        the caller."""
         s = Signal(name="label", value=0)
         uid = yield from plan_stubs.open_run()
 
         frame_collection = SingleLabelFrames()
 
+        # objective and binning do not change between channels
+        pixel_size = self.pixel_size()
+
         for ch in channels:
             yield from self.snap_image_and_other_readings_too(ch)
             img = yield from plan_stubs.rd(self.cam)
             x, y = yield from plan_stubs.rd(self.stage)
-            pixel_size = self.pixel_size()
             frame = Frame(img, coords=[x, y], channel=ch, pixel_size=pixel_size)
             frame_collection.add_frame(frame)
 
+        if next_coords is not None:
+            yield from plan_stubs.abs_set(self.stage, next_coords, group="next_xy")
+
         detected_objects = frame_collection.get_objects()
         self.album.add_object_collection(uid, detected_objects)
 
@@ -241,10 +248,17 @@ class Microscope(BaseMicroscope):
         if grid is None:
             grid = self.generate_grid(*initial_coords, pos="left", num=num)
 
-        for point in grid.midpoints():
-            coords = [float(point["x"]), float(point["y"])]
-            yield from plan_stubs.mv(self.stage, coords)
-            yield from self.cellular_objects(channels)
+        positions = [
+            [float(point["x"]), float(point["y"])] for point in grid.midpoints()
+        ]
+        if not positions:
+            return
+
+        yield from plan_stubs.mv(self.stage, positions[0])
+
+        for next_coords in positions[1:] + [None]:
+            yield from self.cellular_objects(channels, next_coords=next_coords)
+            yield from plan_stubs.wait(group="next_xy")
 
 
 def inspect_plan(plan):
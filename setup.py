@@ -15,6 +15,7 @@ INSTALL_REQUIRES = [
     "tifffile==2020.12.8",
     "cellpose==0.6",
     "numpy>=1.19.4",
+    "numba>=0.55.2",
     "scikit-image>=0.18.1",
     "ophyd==1.6.0",
     "bluesky==1.6.7",